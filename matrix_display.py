@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-# Dependencies: emoji aiohttp brotli aiofile loguru
+# Dependencies: emoji aiohttp brotli loguru
 from __future__ import annotations
 
 ### Internal Configuration ###
@@ -51,14 +51,18 @@ import abc
 import argparse
 import asyncio
 from asyncio import CancelledError
-from collections import defaultdict, Counter
+from collections import deque, OrderedDict
 from collections.abc import Iterable, Iterator, AsyncIterator, Collection, Callable, Coroutine
 from dataclasses import dataclass
 from enum import StrEnum
+import functools
+import heapq
 from pathlib import Path
 from typing import Any, NoReturn
 import re
 import shutil
+import socket
+import struct
 import sys
 import tempfile
 import textwrap
@@ -68,12 +72,16 @@ import uuid
 #import logging
 
 # External modules
-from aiofile import async_open
 import aiohttp
 import emoji
 from loguru import logger as LOGGER
 from loguru._defaults import LOGURU_FORMAT as LOGURU_DEFAULT_FORMAT
 from yarl import URL
+# Optional, faster event loop (not available on Windows)
+try:
+	import uvloop
+except ImportError:
+	uvloop = None
 
 ### ***************************** ###
 
@@ -84,10 +92,20 @@ from yarl import URL
 def exception_str(exception: BaseException) -> str:
 	return "".join( traceback.format_exception_only(exception) ).strip()
 
+def truncate_repr(obj: Any, width: int = 300) -> str:
+	s_repr = repr(obj)
+	return s_repr if len(s_repr) <= width else s_repr[:width-5] + "[...]"
+
 def basic_url(netloc: str, path: str, scheme: str = "http") -> str:
 	components = urllib.parse.ParseResult(scheme, netloc, path, "", "", "")
 	return urllib.parse.urlunparse(components)
 
+I_TRACE_LEVEL_NO: int = LOGGER.level("TRACE").no
+
+def is_trace_enabled() -> bool:
+	# Guard for costly TRACE log arguments, minimum level only changes when sinks are (re)configured
+	return LOGGER._core.min_level <= I_TRACE_LEVEL_NO # type: ignore
+
 
 class QueueClear (asyncio.Queue):
 
@@ -99,9 +117,10 @@ class QueueClear (asyncio.Queue):
 			return
 
 
-class EmoteQueue (QueueClear):
+class EmoteQueue:
+	"""Lightweight unbounded queue: producers never wait, single consumer."""
 
-	@dataclass
+	@dataclass(slots=True)
 	class EmoteItem:
 
 		class Type (StrEnum):
@@ -113,15 +132,104 @@ class EmoteQueue (QueueClear):
 		count: int
 
 
+	def __init__(self) -> None:
+		self._dq_items: deque[EmoteQueue.EmoteItem] = deque()
+		self._not_empty = asyncio.Event()
+
+
+	def qsize(self) -> int:
+		return len(self._dq_items)
+
+
+	def empty(self) -> bool:
+		return not self._dq_items
+
+
+	def put_nowait(self, item: EmoteItem) -> None:
+		self._dq_items.append(item)
+		self._not_empty.set()
+
+
+	def get_nowait(self) -> EmoteItem:
+		try:
+			return self._dq_items.popleft()
+		except IndexError:
+			raise asyncio.QueueEmpty from None
+
+
+	async def get(self) -> EmoteItem:
+		while not self._dq_items:
+			self._not_empty.clear()
+			await self._not_empty.wait()
+		return self._dq_items.popleft()
+
+
+	def clear(self) -> None:
+		self._dq_items.clear()
+
+
 class ImageQueue (QueueClear):
 
-	@dataclass
+	@dataclass(slots=True)
 	class ImageItem:
 
 		name: str
 		count: int
 
 
+class RankLadder:
+	"""Counters ranked by value, highest first, FIFO for an equal rank. Backed by a heap with lazy deletion."""
+
+	def __init__(self) -> None:
+		self._di_count: dict[str, int] = dict()
+		self._di_seq: dict[str, int] = dict() # insertion order
+		self._li_heap: list[tuple[int, int, str]] = list() # (-count, seq, name), may hold stale entries
+		self._i_next_seq = 0
+
+
+	def __len__(self) -> int:
+		return len(self._di_count)
+
+
+	def _push(self, name: str) -> None:
+		if name not in self._di_seq:
+			self._di_seq[name] = self._i_next_seq
+			self._i_next_seq += 1
+
+		# Rebuild when stale entries pile up
+		if len(self._li_heap) > 2 * len(self._di_count) + 64:
+			self._li_heap = [(-count, self._di_seq[key], key) for key, count in self._di_count.items()]
+			heapq.heapify(self._li_heap)
+		else:
+			heapq.heappush(self._li_heap, (-self._di_count[name], self._di_seq[name], name))
+
+
+	def add(self, name: str, count: int) -> None:
+		self._di_count[name] = self._di_count.get(name, 0) + count
+		self._push(name)
+
+
+	def set(self, name: str, count: int) -> None:
+		self._di_count[name] = count
+		self._push(name)
+
+
+	def pop_max(self) -> tuple[str, int]:
+		while True:
+			i_neg_count, i_seq, name = heapq.heappop(self._li_heap) # IndexError if empty
+			# Skip stale entries
+			if self._di_seq.get(name) == i_seq and self._di_count.get(name) == -i_neg_count:
+				del self._di_count[name]
+				del self._di_seq[name]
+				return name, -i_neg_count
+
+
+	def clear(self) -> None:
+		self._di_count.clear()
+		self._di_seq.clear()
+		self._li_heap.clear()
+
+
 # From Loguru documentation
 # class InterceptHandler(logging.Handler):
 # 	def emit(self, record: logging.LogRecord) -> None:
@@ -162,6 +270,13 @@ class IRCBase (abc.ABC):
 		host: str | None = None
 
 
+	# [@<tags>( |$)][:<prefix>( |$)][<command> <params>]
+	# Tags and prefix are kept even when nothing follows them, command stays unset when empty or without params
+	re_message = re.compile(r"(?:@([^ ]*)(?: |$))?(?::([^ ]*)(?: |$))?(?:([^ :@][^ ]*) (.*))?", re.DOTALL)
+	# <name>[!<user>][@<host>]
+	re_prefix = re.compile(r"([^!@]*)(?:!([^@]*))?(?:@(.*))?", re.DOTALL)
+
+
 	@abc.abstractmethod
 	async def run(self) -> NoReturn:
 		pass
@@ -170,21 +285,25 @@ class IRCBase (abc.ABC):
 	def __init__(self, answer: bool, character_encoding: str = "utf-8") -> None:
 		self.b_transmit = bool(answer)
 		self.encoding = str(character_encoding)
+		self._by_eol = "\r\n".encode(self.encoding)
 
 		self.socket_reader: asyncio.StreamReader | None = None
 		self.socket_writer: asyncio.StreamWriter | None = None
 
 
 	## I/O
-	# Readline reused in other classes
+	# Line reader, parametrized by _read_msg()
 	@staticmethod
 	async def read_line_agenerator(socket_reader: asyncio.StreamReader, encoding: str, log_tag: str, end_of_msg: str = "\r\n") -> AsyncIterator[str]:
 		by_eomsg = end_of_msg.encode(encoding)
 		i_eomsg_len = len(end_of_msg)
+		i_by_eomsg_len = len(by_eomsg)
+		b_trace = is_trace_enabled() # logging is configured before any connection
 
 		while True:
 			try:
-				msg = str( await socket_reader.readuntil(by_eomsg) , encoding, "ignore")
+				# Strip the separator before decoding
+				msg = (await socket_reader.readuntil(by_eomsg))[:-i_by_eomsg_len].decode(encoding, "ignore")
 
 			except asyncio.IncompleteReadError as e: # EOF
 				# Is there something expected before EOF?
@@ -220,8 +339,8 @@ class IRCBase (abc.ABC):
 				# Continue waiting for more
 
 			else:
-				msg = msg[0:-i_eomsg_len]
-				LOGGER.opt(lazy=True).trace("{}", lambda: f"{log_tag}: {repr(msg)[1:-1]}")
+				if b_trace:
+					LOGGER.trace("{tag}: {line}", tag=log_tag, line=repr(msg)[1:-1])
 				yield msg
 
 
@@ -232,14 +351,16 @@ class IRCBase (abc.ABC):
 
 	async def _send(self, msg: Iterable) -> None:
 		if isinstance(msg, str):
-			LOGGER.trace("IRC Send: {esc}", esc=repr(msg)[1:-1])
-			self.socket_writer.write(f"{msg}\r\n".encode(self.encoding))
+			if is_trace_enabled():
+				LOGGER.trace("IRC Send: {esc}", esc=repr(msg)[1:-1])
+			self.socket_writer.write(msg.encode(self.encoding) + self._by_eol)
 		elif isinstance(msg, Iterable):
-			if LOGGER._core.min_level <= LOGGER.level("TRACE").no: # type: ignore
+			if is_trace_enabled():
 				msg = list(msg)
 				for line in msg:
 					LOGGER.trace("IRC Send: {esc}", esc=repr(line)[1:-1])
-			self.socket_writer.writelines( (f"{line}\r\n".encode(self.encoding) for line in msg) )
+			# One transport write for the whole batch
+			self.socket_writer.write( b"".join([line.encode(self.encoding) + self._by_eol for line in msg]) )
 		else:
 			raise TypeError()
 		await self.socket_writer.drain()
@@ -247,103 +368,50 @@ class IRCBase (abc.ABC):
 	## ##
 
 	## IRC parsing functions
-	@staticmethod
-	def _extract_header(key: str, pos: int, msg: str) -> tuple[int, str | None]:
-		if msg[pos] == key: # Found
-			i = msg.find(" ", pos)
-			if i == -1: # Nothing after this block
-				return len(msg), msg[pos+1:]
-			# Else extract a section
-			return i + 1, msg[pos+1:i]
-
-		# Not found
-		return pos, None
-
-
-	@staticmethod
-	def _extract_section(key: str, end: int, msg: str) -> tuple[int, str | None]:
-		i = msg.rfind(key, 0, end)
-		if i > -1:
-			return i, msg[i+1:end]
-
-		# Not found
-		return end, None
-
-
 	@classmethod
 	def parse_message(cls, msg: str) -> IRCMessage:
 		parsed = cls.IRCMessage()
-		i_content_len = len(msg)
-		i_pos = 0
-
-		if i_content_len > 1:
-
-			# Optional parts
-			## IRCv3 Message Tag
-			i_pos, parsed.v3tags = cls._extract_header("@", i_pos, msg)
-			if i_pos >= i_content_len: # nothing left to parse, stop
-				return parsed
-			## Prefix
-			i_pos, parsed.prefix = cls._extract_header(":", i_pos, msg)
-			if i_pos >= i_content_len: # nothing left to parse, stop
-				return parsed
-
-			# Command
-			i = msg.find(' ', i_pos)
-			if i > -1:
-				parsed.command = msg[i_pos:i]
-				parsed.params = msg[i+1:]
+
+		# Always matches, every part is optional
+		parsed.v3tags, parsed.prefix, parsed.command, parsed.params = cls.re_message.match(msg).groups() # type: ignore
 
 		return parsed
 
 
 	@staticmethod
 	def parse_ircv3_tags(tags: str) -> dict[str, str]:
-		return {key: val for key, _, val in (tag.partition("=") for tag in tags.split(";") if tag) if key}
+		di_tags: dict[str, str] = dict()
+
+		for tag in tags.split(";"):
+			i = tag.find("=")
+			if i < 0: # key only (also skips empty tags)
+				if tag:
+					di_tags[tag] = ""
+			elif i > 0: # key=value, ignore empty keys
+				di_tags[tag[:i]] = tag[i+1:]
+
+		return di_tags
 
 
 	@classmethod
 	def parse_prefix(cls, prefix: str) -> IRCMessagePrefix:
 		parsed = cls.IRCMessagePrefix()
-		i_pos = len(prefix)
 
-		if i_pos > 0:
-			i_pos, parsed.host = cls._extract_section("@", i_pos, prefix)
-			i_pos, parsed.user = cls._extract_section("!", i_pos, prefix)
-			parsed.name = prefix[0:i_pos]
+		if prefix:
+			parsed.name, parsed.user, parsed.host = cls.re_prefix.match(prefix).groups() # type: ignore # always matches
 
 		return parsed
 
 
 	@staticmethod
 	def parse_params(params: str) -> tuple[list, str]:
-		li_middle: list[str] = list()
-		i_content_len = len(params)
-		i_pos = 0
-
-		while i_pos < i_content_len:
-
-			# Reached trailing?
-			if params[i_pos] == ":":
-				return (li_middle, params[i_pos+1:])
-
-			# Skip preceding spaces
-			elif params[i_pos] == " ":
-				i_pos += 1
-
-			# Extract one middle
-			else:
-				i_found = params.find(" ", i_pos)
-
-				if i_found > 0:
-					li_middle.append(params[i_pos:i_found])
-					i_pos = i_found + 1
-				else:
-					li_middle.append(params[i_pos:])
-					i_pos = i_content_len
-
-		# Reaching here if there is no trailing
-		return (li_middle, "")
+		# Trailing starts with the first token beginning with ":"
+		if params.startswith(":"):
+			return ([], params[1:])
+		i = params.find(" :")
+		if i < 0: # no trailing
+			return ([middle for middle in params.split(" ") if middle], "")
+		return ([middle for middle in params[:i].split(" ") if middle], params[i+2:])
 
 	## ##
 
@@ -383,6 +451,9 @@ class TMIClient (IRCBase):
 
 	s_server_hostname: str = "irc.chat.twitch.tv"
 	i_server_port: int = 6697 # "SSL"
+	# Reconnection backoff, doubles after each failure (seconds)
+	i_retry_delay_min: int = 5
+	i_retry_delay_max: int = 300
 
 
 	def __init__(self, channel: str, user: str = "", oauth2_token: str = "") -> None:
@@ -435,7 +506,7 @@ class TMIClient (IRCBase):
 
 	def _in_join(self, msg: IRCBase.IRCMessage) -> None:
 		chan = msg.params
-		if ( msg.prefix != None
+		if ( msg.prefix is not None
 		     and self.parse_prefix(msg.prefix).name == self.s_user
 		     and chan
 		     and chan[0] == "#" ):
@@ -444,7 +515,7 @@ class TMIClient (IRCBase):
 
 	def _in_part(self, msg: IRCBase.IRCMessage) -> None:
 		chan = msg.params
-		if ( msg.prefix != None
+		if ( msg.prefix is not None
 		     and self.parse_prefix(msg.prefix).name == self.s_user
 		     and chan
 		     and chan[0] == "#" ):
@@ -528,13 +599,15 @@ class TMIClient (IRCBase):
 
 
 	async def run(self) -> NoReturn:
+		i_retry_delay = self.i_retry_delay_min
+
 		while True: # reconnection loop
 
 			# Open connection
 			try:
 				self.socket_reader, self.socket_writer = await asyncio.open_connection(self.s_server_hostname, self.i_server_port, ssl=True)
 			except OSError as e:
-				LOGGER.error("TMI: Can't connect to Twitch Messaging Interface! {exc!s}\nRetry in 5 minutes.", exc=e)
+				LOGGER.error("TMI: Can't connect to Twitch Messaging Interface! {exc!s}\nRetry in {delay} seconds.", exc=e, delay=i_retry_delay)
 				# Try to reconnect
 			else: # Socket is open
 
@@ -547,6 +620,7 @@ class TMIClient (IRCBase):
 					## Try to authenticate
 					await self._auth(li_deferred_messages)
 					self.b_available = True
+					i_retry_delay = self.i_retry_delay_min # connection is healthy, reset backoff
 					## Join channel(s), fails silently
 					await self.join(self.s_chan)
 					## Consume other messages from previous steps
@@ -564,18 +638,21 @@ class TMIClient (IRCBase):
 					raise
 
 				except (EOFError, TimeoutError, ConnectionError) as e:
-					LOGGER.error("TMI: Twitch Messaging Interface connection error! {exc!s}\nRetry in 5 minutes.", exc=e)
+					LOGGER.error("TMI: Twitch Messaging Interface connection error! {exc!s}\nRetry in {delay} seconds.", exc=e, delay=i_retry_delay)
 					# Try to reconnect
 
 				finally:
 					self.b_available = False
 					self.socket_writer.close()
+					# Don't let a peer that never acknowledges delay reconnection
 					try:
-						await self.socket_writer.wait_closed()
+						async with asyncio.timeout(5):
+							await self.socket_writer.wait_closed()
 					except Exception:
 						pass
 
-			await asyncio.sleep(300)
+			await asyncio.sleep(i_retry_delay)
+			i_retry_delay = min(2 * i_retry_delay, self.i_retry_delay_max)
 
 	## ##
 
@@ -583,7 +660,11 @@ class TMIClient (IRCBase):
 
 class ProcessTwitchEmotes:
 
-	def __init__(self, q: EmoteQueue, no_summation: bool, forbidden_nicks: set, forbidden_emotes: set) -> None:
+	# <id>:<pos> anchored at the start of each specifier, those with an empty id or position don't match
+	re_emotes_tag = re.compile(r"(?:^|/)([^:/]+):([^/]+)")
+
+
+	def __init__(self, q: EmoteQueue, no_summation: bool, forbidden_nicks: set[str], forbidden_emotes: set[str]) -> None:
 		if isinstance(q, EmoteQueue):
 			self.emotes_q = q
 		else:
@@ -601,24 +682,44 @@ class ProcessTwitchEmotes:
 
 	## String processing helpers
 	@staticmethod
-	def extract_emojis(s: str, only_list: bool) -> Iterator[tuple[str, int]]:
-		# Get each emoji occurrence, remove the presentation specifier if there is no zero-width joiner
-		emojis = (chars if match.is_zwj() else chars.replace("\ufe0e", "").replace("\ufe0f", "") for chars, match in emoji.analyze(s, False, True))
+	def _iter_emojis(s: str) -> Iterator[str]:
+		# Get each emoji occurrence
+		for chars, match in emoji.analyze(s, False, True):
+			# Remove the presentation specifier if there is no zero-width joiner
+			if not match.is_zwj():
+				chars = chars.replace("\ufe0e", "").replace("\ufe0f", "")
+			yield chars
+
 
+	@classmethod
+	def _extract_unique_emojis(cls, s: str) -> Iterator[tuple[str, int]]:
+		st_seen: set[str] = set()
+
+		# Remove duplicates, count is 1, emitted as soon as found
+		for chars in cls._iter_emojis(s):
+			if chars not in st_seen:
+				st_seen.add(chars)
+				yield chars, 1
+
+
+	@classmethod
+	def extract_emojis(cls, s: str, only_list: bool) -> Iterator[tuple[str, int]]:
 		if only_list:
-			# Remove duplicates
-			emojis = set(emojis)
-			# Set count to 1
-			return ((emoji, 1) for emoji in emojis)
+			return cls._extract_unique_emojis(s)
 
-		# Else accumulate
-		return Counter(emojis).items()
+		di_emojis: dict[str, int] = dict()
+
+		# Accumulate
+		for chars in cls._iter_emojis(s):
+			di_emojis[chars] = di_emojis.get(chars, 0) + 1
+
+		return iter(di_emojis.items())
 
 
 	@staticmethod
+	@functools.lru_cache(maxsize=4096) # same emojis are posted over and over
 	def str_to_formatted_codepoints(s: str) -> str:
-		codes = (f"{code:x}" for code in (ord(char) for char in s))
-		return "-".join(codes)
+		return "-".join([f"{ord(char):x}" for char in s])
 
 	## ##
 
@@ -635,27 +736,26 @@ class ProcessTwitchEmotes:
 		b_skip_content = False
 		EM = self.emotes_q.EmoteItem
 		EM_T = self.emotes_q.EmoteItem.Type
+		# Locals for the loops below
+		put_emote = self.emotes_q.put_nowait
+		st_forbidden_ids = self.st_forbidden_ids
+		b_no_sum = self.b_no_sum
 
 		# Filter out ignored nicks (also rejects no nick)
 		s_nick = IRCBase.parse_prefix(msg.prefix).name
 		if s_nick and s_nick not in self.st_forbidden_nik:
 			# Count emotes
-			if msg.v3tags != None:
+			if msg.v3tags is not None:
 				di_tags = IRCBase.parse_ircv3_tags(msg.v3tags)
 
-				if "emotes" in di_tags and di_tags["emotes"]:
-					twi_emotes = di_tags["emotes"].split("/")
-					twi_emotes = (emote_specifier.partition(":") for emote_specifier in twi_emotes)
-					twi_emotes = ((emote_id, emote_pos) for emote_id, _, emote_pos in twi_emotes if emote_id and emote_id not in self.st_forbidden_ids and emote_pos)
-					if self.b_no_sum:
-						twi_emotes = ((emote_id, 1) for emote_id, emote_pos in twi_emotes)
-					else:
-						twi_emotes = ((emote_id, emote_pos.count(",")+1) for emote_id, emote_pos in twi_emotes)
-
-					for s_id, i_count in twi_emotes:
-						self.emotes_q.put_nowait( EM(EM_T.TWITCH_EMOTE, s_id, i_count) )
+				s_emotes = di_tags.get("emotes")
+				if s_emotes:
+					# <id>:<pos>{,<pos>}{/<id>:<pos>{,<pos>}}
+					for s_id, s_pos in self.re_emotes_tag.findall(s_emotes):
+						if s_id not in st_forbidden_ids:
+							put_emote( EM(EM_T.TWITCH_EMOTE, s_id, 1 if b_no_sum else s_pos.count(",")+1) )
 
-					b_skip_content = "emote-only" in di_tags and di_tags["emote-only"] == "1"
+					b_skip_content = di_tags.get("emote-only") == "1"
 
 			# Count emojis
 			if not b_skip_content:
@@ -663,10 +763,10 @@ class ProcessTwitchEmotes:
 				_, s_text = IRCBase.parse_params(msg.params)
 
 				# Extract emojis
-				for s_emoji, i_count in self.extract_emojis(s_text, self.b_no_sum):
+				for s_emoji, i_count in self.extract_emojis(s_text, b_no_sum):
 					s_emoji_cp = self.str_to_formatted_codepoints(s_emoji)
-					if s_emoji_cp not in self.st_forbidden_ids:
-						self.emotes_q.put_nowait( EM(EM_T.EMOJI, s_emoji_cp, i_count) )
+					if s_emoji_cp not in st_forbidden_ids:
+						put_emote( EM(EM_T.EMOJI, s_emoji_cp, i_count) )
 
 		#((not "first-msg" in di_tags) or di_tags["first-msg"] == "0")
 
@@ -677,7 +777,7 @@ class ProcessTwitchEmotes:
 # Assembles the TMI client with the emote processing mixin
 class TMIEmotesSource (ProcessTwitchEmotes, TMIClient):
 
-	def __init__(self,  emotes_id_q: EmoteQueue, no_summation: bool, forbidden_users: set, forbidden_emotes: set, channel: str, user: str = "", oauth2_token: str = "") -> None:
+	def __init__(self,  emotes_id_q: EmoteQueue, no_summation: bool, forbidden_users: set[str], forbidden_emotes: set[str], channel: str, user: str = "", oauth2_token: str = "") -> None:
 		ProcessTwitchEmotes.__init__(self, emotes_id_q, no_summation, forbidden_users, forbidden_emotes)
 		TMIClient.__init__(self, channel, user, oauth2_token)
 
@@ -696,9 +796,11 @@ class GetImages:
 	url_twitch_base = URL("https://static-cdn.jtvnw.net/emoticons/v2/")
 	url_emoji_base = URL("https://cdn.jsdelivr.net/gh/toine512/twemoji-bitmaps@main/128x128_png32/")
 	path_cache = Path( tempfile.gettempdir() ) / "python_matrix_reloaded_cache"
+	i_batch_size: int = 16 # maximum concurrent downloads
+	re_filename_strip = re.compile(r"(?u)[^-\w.]")
 
 
-	def __init__(self, emotes_id_q: EmoteQueue, forbidden_emotes: set) -> None:
+	def __init__(self, emotes_id_q: EmoteQueue, forbidden_emotes: set[str]) -> None:
 		if isinstance(emotes_id_q, EmoteQueue):
 			self.emotes_q = emotes_id_q
 		else:
@@ -714,16 +816,17 @@ class GetImages:
 		self.b_do_twitch = False
 		self.b_do_emoji = False
 		self._li_consumers: list[ImageQueue] = list()
+		self._http_cli: aiohttp.ClientSession | None = None
 
 
 	## Caching (FS) helpers
-	@staticmethod
-	def to_filename(name: str) -> str:
+	@classmethod
+	def to_filename(cls, name: str) -> str:
 		"""Letters and _ . - characters. Others removed. Doesn't check for reserved names."""
 		# Cleanup
 		name = name.strip().replace(" ", "_")
 		# Keep only Unicode letters and _ . -
-		name = re.sub(r"(?u)[^-\w.]", "", name)
+		name = cls.re_filename_strip.sub("", name)
 		# Is result invalid?
 		if name in (".", ".."):
 			name = ""
@@ -744,9 +847,26 @@ class GetImages:
 	def register_consumer(self, q: ImageQueue) -> None:
 		self._li_consumers.append(q)
 
+
+	async def close(self) -> None:
+		if self._http_cli is not None:
+			await self._http_cli.close()
+			self._http_cli = None
+
 	## ##
 
 	## Task
+	# Kept across show restarts, keep-alive connections and DNS cache are preserved
+	def _get_http_cli(self) -> aiohttp.ClientSession:
+		if self._http_cli is None or self._http_cli.closed:
+			# aiohttp client configuration:
+			# - as many connections per host as the batch size, so that keep-alive sockets are reused
+			# - cache DNS for 5 min
+			# - request timeout 1 min
+			self._http_cli = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=2*self.i_batch_size, limit_per_host=self.i_batch_size, ttl_dns_cache=300), timeout=aiohttp.ClientTimeout(total=60))
+		return self._http_cli
+
+
 	async def _check_availability(self, http_cli: aiohttp.ClientSession) -> None:
 		# Test Twitch static CDN
 		# Get a small Kappa
@@ -813,8 +933,14 @@ class GetImages:
 				match http_res.status:
 					case 200:
 						try:
-							async with async_open(file, "wb") as fd:
-								await fd.write( await http_res.read() )
+							# Stream the body to disk as it arrives, no full-body buffer
+							fd = await asyncio.to_thread(file.open, "wb")
+							try:
+								async for chunk in http_res.content.iter_any():
+									await asyncio.to_thread(fd.write, chunk)
+							finally:
+								# Closing flushes the last buffered bytes, also off the loop
+								await asyncio.to_thread(fd.close)
 						except:
 							# Don't leave empty or incomplete files behind, especially in case of task cancellation
 							file.unlink(True)
@@ -834,33 +960,57 @@ class GetImages:
 
 
 	async def run(self) -> NoReturn:
-		async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60)) as http_cli:
+		http_cli = self._get_http_cli()
+
+		while True: # retry loop
+
+			await self._check_availability(http_cli)
+
+			while True:
+				# Wait forever for items
+				emote = await self.emotes_q.get()
 
-			while True: # retry loop
+				# Then take what's already waiting, up to the batch size
+				# Same image requested multiple times is downloaded once
+				li_items: list[tuple[EmoteQueue.EmoteItem, Path]] = list() # queue order
+				di_downloads: dict[Path, EmoteQueue.EmoteItem] = dict()
+				try:
+					while True:
+						# Get a cache path for the image
+						path_file = self._get_cachepath(f"{emote.type}_{emote.value}")
+						if path_file is not None:
+							li_items.append( (emote, path_file) )
+							di_downloads.setdefault(path_file, emote)
+						if len(di_downloads) >= self.i_batch_size:
+							break
+						emote = self.emotes_q.get_nowait()
+				except asyncio.QueueEmpty:
+					pass
 
-				await self._check_availability(http_cli)
+				# Download missing files concurrently
+				li_results = await asyncio.gather(*(self._download_emote(emote, path_file, http_cli) for path_file, emote in di_downloads.items()), return_exceptions=True)
+				di_results = dict(zip(di_downloads, li_results))
 
-				while True:
-					# Wait forever for items
-					emote = await self.emotes_q.get()
+				b_restart = False
+				for result in li_results:
+					match result:
+						case aiohttp.ClientError() | OSError(): # aiohttp client errors, file errors
+							b_restart = True # maybe recoverable error, restart
 
-					# Get a cache path for the image
-					path_file = self._get_cachepath(f"{emote.type}_{emote.value}")
+						case BaseException():
+							raise result
 
-					# Download if missing
-					try:
-						# Returns true if file is available
-						if not await self._download_emote(emote, path_file, http_cli):
-							continue # if not, abort, go to next item
-					except (aiohttp.ClientError, OSError): # aiohttp client errors, file errors
-						break # maybe recoverable error, restart
+				# Send available images to consumers, one item per queued emote
+				for emote, path_file in li_items:
+					if di_results[path_file] is True:
+						for q in self._li_consumers:
+							q.put_nowait( q.ImageItem(path_file.name, emote.count) )
 
-					# Send to consumers
-					for q in self._li_consumers:
-						q.put_nowait( q.ImageItem(path_file.name, emote.count) )
+				if b_restart:
+					break
 
 
-				await asyncio.sleep(300)
+			await asyncio.sleep(300)
 
 	## ##
 
@@ -872,8 +1022,18 @@ class GetImages:
 
 class MatrixPush:
 
+	di_upload_headers = {"Content-Type": "application/octet-stream"}
+	# In-memory copy of recently uploaded files, shared by all instances
+	i_file_cache_max_size: int = 32 * 1024 * 1024 # bytes
+	_od_file_cache: OrderedDict[str, bytes] = OrderedDict()
+	_i_file_cache_size: int = 0
+
+
 	def __init__(self, host: str) -> None:
 		self._s_host = str(host).strip()
+		# Endpoints are invariant, parse once
+		self._url_image = URL( basic_url(self._s_host, "/image") )
+		self._url_clear = URL( basic_url(self._s_host, "/clear") )
 		self._st_banlist: set[str] = set()
 		self._task_loop: asyncio.AbstractEventLoop | None = None
 		self._clear_flag = False
@@ -881,166 +1041,206 @@ class MatrixPush:
 		self._not_uploading.set()
 		self.image_q = ImageQueue()
 		self.pause = False
+		self._http_cli: aiohttp.ClientSession | None = None
+
 
+	## Cache helper
+	@classmethod
+	async def _read_image(cls, name: str) -> bytes:
+		od_cache = cls._od_file_cache
+
+		# Hit
+		data = od_cache.get(name)
+		if data is not None:
+			od_cache.move_to_end(name)
+			return data
+
+		# Miss, read from disk (raises OSError)
+		data = await asyncio.to_thread( (GetImages.path_cache/name).read_bytes )
+		if name not in od_cache: # may have been added by another instance meanwhile
+			od_cache[name] = data
+			cls._i_file_cache_size += len(data)
+			# Evict least recently used
+			while cls._i_file_cache_size > cls.i_file_cache_max_size:
+				_, old_data = od_cache.popitem(last=False)
+				cls._i_file_cache_size -= len(old_data)
+
+		return data
+
+	## ##
 
 	## App-available methods
 	async def clear(self) -> bool:
 		# Is task running?
-		if self._task_loop != None:
+		if self._task_loop is not None:
 			# Do the internal clear
 			# Set clear flag
 			self._clear_flag = True
 			await self._not_uploading.wait()
 
-		# Send a clear command to the display anyway
-		async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as http_cli:
-			try:
-				async with http_cli.get(basic_url(self._s_host, "/clear"), compress=False) as http_res:
-					match http_res.status:
-						case 200:
-							LOGGER.info("Display: Matrix cleared.")
-							return True
+		# Send a clear command to the display anyway, through the kept session
+		# An upload may already have started again, CLEAR uses the second connection
+		http_cli = self._get_http_cli()
+		try:
+			async with http_cli.get(self._url_clear, compress=False, timeout=aiohttp.ClientTimeout(total=30)) as http_res:
+				match http_res.status:
+					case 200:
+						LOGGER.info("Display: Matrix cleared.")
+						return True
 
-						case 500:
-							LOGGER.error("Display: Clearing matrix failed. {}", await http_res.text())
+					case 500:
+						LOGGER.error("Display: Clearing matrix failed. {}", await http_res.text())
 
-						case _:
-							raise RuntimeError("Unexpected matrix HTTP response!")
+					case _:
+						raise RuntimeError("Unexpected matrix HTTP response!")
 
-			except aiohttp.ClientError as e:
-				LOGGER.error("Display: Unable to clear matrix! {exc!s}", exc=e)
+		except aiohttp.ClientError as e:
+			LOGGER.error("Display: Unable to clear matrix! {exc!s}", exc=e)
 
 		return False
 
+
+	async def close(self) -> None:
+		if self._http_cli is not None:
+			await self._http_cli.close()
+			self._http_cli = None
+
 	## ##
 
 	## Task
-	async def run(self) -> NoReturn:
-		try:
-			self._task_loop = asyncio.get_running_loop()
-
+	# Kept across show restarts, keep-alive connection and (mDNS) DNS cache are preserved
+	def _get_http_cli(self) -> aiohttp.ClientSession:
+		if self._http_cli is None or self._http_cli.closed:
 			# aiohttp client configuration:
 			# - cache DNS for 1h (usually mDNS)
 			# - request timeout 3 min (account for reachability issues)
-			async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(use_dns_cache=True, ttl_dns_cache=3600, limit_per_host=1), timeout=aiohttp.ClientTimeout(total=180)) as http_cli:
-
-				di_ladder: defaultdict[str, int] = defaultdict(lambda: 0)
-				while True:
-
-					# Are we accumulating?
-					if len(di_ladder) > 0:
-						# Is clear requested
-						if self._clear_flag:
-							self.image_q.clear()
-							di_ladder.clear()
-							# Unset the flag
-							self._clear_flag = False
-							# Stop
-							continue
+			# - 2 connections: uploads are sequential, the second one is for CLEAR
+			self._http_cli = aiohttp.ClientSession(connector=aiohttp.TCPConnector(use_dns_cache=True, ttl_dns_cache=3600, limit_per_host=2), timeout=aiohttp.ClientTimeout(total=180))
+		return self._http_cli
 
-						# Else consume what's currently in the queue (guaranteed to terminate)
-						# Not thread-safe: the queue must only be emptied in the same loop
-						for _ in range( self.image_q.qsize() ):
-							image = self.image_q.get_nowait() # control is never given back thus the queue can't be emptied elsewhere
-							# Accumulate if file is not banned from upload (previous error)
-							# Insertion order is preserved, so it's FIFO for an equal rank.
-							if image.name not in self._st_banlist:
-								di_ladder[image.name] += image.count
 
-						# Get highest ranked emote
-						s_name = max(di_ladder, key=di_ladder.get)
-						i_count = di_ladder[s_name]
-						del di_ladder[s_name]
+	async def run(self) -> NoReturn:
+		try:
+			self._task_loop = asyncio.get_running_loop()
 
-					else:
-						# Nothing to clear
-						# Wait for a new image to process
-						image = await self.image_q.get()
-						# Unset any pending clear (there was no backlog to clear while waiting)
-						self._clear_flag = False
-						# Stop if file is banned from upload (previous error)
-						if image.name in self._st_banlist:
-							continue
-						s_name = image.name
-						i_count = image.count
+			http_cli = self._get_http_cli()
 
-					# Trap to pause operation
-					while self.pause:
-						await asyncio.sleep(1.5)
+			ladder = RankLadder()
+			while True:
 
-					# Abort upload if a clear was requested during pause
+				# Are we accumulating?
+				if len(ladder) > 0:
+					# Is clear requested
 					if self._clear_flag:
+						self.image_q.clear()
+						ladder.clear()
+						# Unset the flag
+						self._clear_flag = False
+						# Stop
 						continue
 
-					# Upload to the matrix
-					## Expected response codes
-					## 200 OK: Loaded
-					## 503 Service Unavailable: no slot available, retry later!
-					## 408 Request Timeout: something went wrong during the transfer, can retry
-					## 413 Content Too Large: file too large
-					## 422 Unprocessable Content: bad file
-					## 500 Internal Server Error: something is very wrong
+					# Else consume what's currently in the queue (guaranteed to terminate)
+					# Not thread-safe: the queue must only be emptied in the same loop
+					for _ in range( self.image_q.qsize() ):
+						image = self.image_q.get_nowait() # control is never given back thus the queue can't be emptied elsewhere
+						# Accumulate if file is not banned from upload (previous error)
+						# Insertion order is preserved, so it's FIFO for an equal rank.
+						if image.name not in self._st_banlist:
+							ladder.add(image.name, image.count)
 
-					## Open file
-					try:
-						async with async_open(GetImages.path_cache/s_name, "rb") as fd:
-							## POST
-							# Signal transaction
-							self._not_uploading.clear()
+					# Get highest ranked emote
+					s_name, i_count = ladder.pop_max()
 
-							# Request
-							try:
-								async with http_cli.post(basic_url(self._s_host, "/image"), data=await fd.read(), headers={"Content-Type": "application/octet-stream"}, compress=False, chunked=None, expect100=False) as http_res:
-									match http_res.status:
-									# Normal operation
-										case 200:
-											# Good
-											LOGGER.debug("Display: Uploaded {name} to matrix.", name=s_name)
-
-										case 503:
-											# Go into accumulation mode: set the image aside
-											di_ladder[s_name] = i_count
-											http_res.release()
-											LOGGER.debug("Display: Matrix memory full.")
-											# Wait for a bit and retry
-											await asyncio.sleep(2.5)
-
-									# Errors
-										case 408:
-											# Go into accumulation mode: set the image aside
-											di_ladder[s_name] = i_count
-											LOGGER.error("Display: Matrix request timeout, something went wrong with the transfer. Retrying.")
-											# Retry
-											await asyncio.sleep(0.1)
-
-										case 413 | 422:
-											# Error, ban the file
-											self._st_banlist.add(s_name)
-											LOGGER.debug("Display: Matrix error: {} {}", http_res.reason, await http_res.text() )
-											LOGGER.info("Display: Adding {name} to forbidden list.", name=s_name)
-
-										case 500:
-											# Something is wrong, just do nothing
-											LOGGER.error("Display: Matrix internal server error! {}", http_res.text())
-
-										case _:
-											raise RuntimeError("Unexpected matrix HTTP response!")
-
-							except aiohttp.ClientError as e:
-								# Go into accumulation mode: set the image aside
-								di_ladder[s_name] = i_count
-								# Error may be unreachability due to address changing (got through mDNS)
-								http_cli.connector.clear_dns_cache() # type: ignore
-								# Maybe recoverable error, wait 30 s and retry
-								LOGGER.warning("Display: Matrix unavailable. {exc!s}\nRetry in 30 seconds.", exc=e)
-								await asyncio.sleep(30)
+				else:
+					# Nothing to clear
+					# Wait for a new image to process
+					image = await self.image_q.get()
+					# Unset any pending clear (there was no backlog to clear while waiting)
+					self._clear_flag = False
+					# Stop if file is banned from upload (previous error)
+					if image.name in self._st_banlist:
+						continue
+					s_name = image.name
+					i_count = image.count
+
+				# Trap to pause operation
+				while self.pause:
+					await asyncio.sleep(1.5)
+
+				# Abort upload if a clear was requested during pause
+				if self._clear_flag:
+					continue
+
+				# Upload to the matrix
+				## Expected response codes
+				## 200 OK: Loaded
+				## 503 Service Unavailable: no slot available, retry later!
+				## 408 Request Timeout: something went wrong during the transfer, can retry
+				## 413 Content Too Large: file too large
+				## 422 Unprocessable Content: bad file
+				## 500 Internal Server Error: something is very wrong
+
+				## Read file
+				try:
+					data = await self._read_image(s_name)
+				except OSError:
+					LOGGER.error("Display: Cache miss. This isn't supposed to happen!")
+					continue
 
-							finally:
-								# Signal end of transaction
-								self._not_uploading.set()
+				## POST
+				# Signal transaction
+				self._not_uploading.clear()
+
+				# Request
+				try:
+					async with http_cli.post(self._url_image, data=data, headers=self.di_upload_headers, compress=False, chunked=None, expect100=False) as http_res:
+						match http_res.status:
+						# Normal operation
+							case 200:
+								# Good
+								LOGGER.debug("Display: Uploaded {name} to matrix.", name=s_name)
+
+							case 503:
+								# Go into accumulation mode: set the image aside
+								ladder.set(s_name, i_count)
+								http_res.release()
+								LOGGER.debug("Display: Matrix memory full.")
+								# Wait for a bit and retry
+								await asyncio.sleep(2.5)
+
+						# Errors
+							case 408:
+								# Go into accumulation mode: set the image aside
+								ladder.set(s_name, i_count)
+								LOGGER.error("Display: Matrix request timeout, something went wrong with the transfer. Retrying.")
+								# Retry
+								await asyncio.sleep(0.1)
+
+							case 413 | 422:
+								# Error, ban the file
+								self._st_banlist.add(s_name)
+								LOGGER.debug("Display: Matrix error: {} {}", http_res.reason, await http_res.text() )
+								LOGGER.info("Display: Adding {name} to forbidden list.", name=s_name)
+
+							case 500:
+								# Something is wrong, just do nothing
+								LOGGER.error("Display: Matrix internal server error! {}", http_res.text())
+
+							case _:
+								raise RuntimeError("Unexpected matrix HTTP response!")
+
+				except aiohttp.ClientError as e:
+					# Go into accumulation mode: set the image aside
+					ladder.set(s_name, i_count)
+					# Error may be unreachability due to address changing (got through mDNS)
+					http_cli.connector.clear_dns_cache() # type: ignore
+					# Maybe recoverable error, wait 30 s and retry
+					LOGGER.warning("Display: Matrix unavailable. {exc!s}\nRetry in 30 seconds.", exc=e)
+					await asyncio.sleep(30)
 
-					except OSError:
-						LOGGER.error("Display: Cache miss. This isn't supposed to happen!")
+				finally:
+					# Signal end of transaction
+					self._not_uploading.set()
 
 		except asyncio.CancelledError:
 			self._task_loop = None
@@ -1057,59 +1257,304 @@ class MatrixPush:
 class CommandInterface:
 
 	encoding = "utf-8"
+	i_read_size: int = 4096
+	i_line_max_size: int = 2**16 # same as asyncio.StreamReader default limit
+
+	# Help prompt, encoded once
+	s_help = "\n| ".join((
+		"  ** Command list **",
+		"     ? - Shows this message.",
+		"    ON - Starts operation.",
+		"   OFF - Stops operation.",
+		" CLEAR - Clears all queues and the matrix display.",
+		" PAUSE - Stops sending images to the matrix display, emotes and emoji collection remaining active.",
+		"RESUME - Resumes sending images to the matrix display. The backlog is sent.",
+		"TELNET - All line breaks (LF) are converted to CR LF for the lifetime of the connection.",
+		"    JOIN :<#chan>{,<#chan>{,...}} - Joins <#chan>.",
+		"  USRBAN :<nick>                  - Adds <nick> to the list of forbidden usernames.",
+		"USRUNBAN :<nick>                  - Removes <nick> from the list of forbidden usernames."
+	))
+	# Keyed by line break bytes
+	di_help = {
+		b"\n": f"{s_help}\r\n".encode(encoding),
+		b"\r\n": (s_help.replace("\n", "\r\n") + "\r\n").encode(encoding)
+	}
+
+	class _NullWriter:
+		# Stands for the client connection when there is none
+		def get_extra_info(self, name: str, default: Any = None) -> Any:
+			return default
+
+		def close(self) -> None:
+			pass
 
 
 	def __init__(self, app: MatrixReloadedApp) -> None:
 		self._app = app
 
-		self._client_socket_writer: asyncio.StreamWriter | None = None
+		self._client_socket_writer: asyncio.StreamWriter | CommandInterface._NullWriter = self._NullWriter()
+
+		# Command dispatch table (TELNET is handled by the client handler, it changes the connection state)
+		self._di_commands: dict[str, Callable[[asyncio.StreamWriter, bytes, str], Coroutine[Any, Any, None]]] = {
+			"on": self._cmd_on,
+			"off": self._cmd_off,
+			"join": self._cmd_join,
+			"clear": self._cmd_clear,
+			"pause": self._cmd_pause,
+			"resume": self._cmd_resume,
+			"usrban": self._cmd_usrban,
+			"usrunban": self._cmd_usrunban,
+			"?": self._cmd_help,
+			"help": self._cmd_help,
+			"h": self._cmd_help
+		}
 
 
 	## Command processing helper
 	@staticmethod
 	def interpret_bs(line: str) -> str:
-		while True:
-			pos = line.find("\b")
-			if pos < 0:
-				break
-			elif pos == 0:
-				line = line[1:]
+		if "\b" not in line:
+			return line
+
+		li_chars: list[str] = list()
+		for char in line:
+			if char == "\b":
+				# Erase previous character, if any
+				if li_chars:
+					li_chars.pop()
 			else:
-				line = line[0:pos-1] + line[pos+1:]
-		return line
+				li_chars.append(char)
+		return "".join(li_chars)
 
 	## ##
 
 	## I/O
-	# Readline parametrized for this class
+	# Own line reader (LF separated, with a line length limit), independent from IRCBase.read_line_agenerator()
+	# Reads large chunks and splits lines locally, a burst of commands costs one read
 	@classmethod
-	def _read(cls, socket_reader: asyncio.StreamReader) -> AsyncIterator[str]:
-		return IRCBase.read_line_agenerator(socket_reader, cls.encoding, "Remote Read", "\n")
+	async def _read(cls, socket_reader: asyncio.StreamReader) -> AsyncIterator[str]:
+		by_buffer = bytearray()
+		b_trace = is_trace_enabled() # logging is configured before any connection
+		b_discard = False # the start of the current line was purged
+
+		while True:
+			by_chunk = await socket_reader.read(cls.i_read_size)
+			if not by_chunk: # EOF, an incomplete line is dropped
+				raise EOFError("Command connection closed.")
+			by_buffer += by_chunk
+
+			# Yield every complete line
+			i_start = 0
+			while (i_end := by_buffer.find(b"\n", i_start)) >= 0:
+				i_line_start = i_start
+				i_start = i_end + 1
+				if b_discard: # remainder of a purged line
+					b_discard = False
+				elif i_end - i_line_start > cls.i_line_max_size:
+					LOGGER.trace("Remote Read: line too long")
+				else:
+					msg = by_buffer[i_line_start:i_end].decode(cls.encoding, "ignore")
+					if b_trace:
+						LOGGER.trace("Remote Read: {line}", line=repr(msg)[1:-1])
+					yield msg
+			del by_buffer[:i_start]
+
+			# Data accumulated without a separator, purge and drop the rest of the line
+			if len(by_buffer) > cls.i_line_max_size:
+				LOGGER.trace("Remote Read: line too long")
+				by_buffer.clear()
+				b_discard = True
 
 	@classmethod
-	async def _send(cls, socket_writer: asyncio.StreamWriter, crlf_breaks: bool, msg: str) -> None:
-		LOGGER.trace("Remote Send: {esc}", esc=repr(msg)[1:-1])
-		if crlf_breaks:
-			msg = msg.replace("\n", "\r\n")
-		socket_writer.write(f"{msg}\r\n".encode(cls.encoding))
+	async def _send(cls, socket_writer: asyncio.StreamWriter, by_eol: bytes, msg: str) -> None:
+		if is_trace_enabled():
+			LOGGER.trace("Remote Send: {esc}", esc=repr(msg)[1:-1])
+		# Normalize first so that existing CR LF aren't doubled, then apply the connection's line breaks
+		by_msg = msg.encode(cls.encoding).replace(b"\r\n", b"\n").replace(b"\n", by_eol)
+
+		# Message and terminator in a single write
+		socket_writer.write(by_msg + b"\r\n")
+		await socket_writer.drain()
+
+	@staticmethod
+	def _reset_connection(socket_writer: asyncio.StreamWriter | CommandInterface._NullWriter) -> None:
+		# SO_LINGER 0: closing sends RST, no FIN handshake nor TIME_WAIT
+		sock = socket_writer.get_extra_info("socket")
+		if sock is not None:
+			try:
+				sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("HH" if sys.platform == "win32" else "ii", 1, 0)) # struct linger
+			except OSError:
+				pass
+		socket_writer.close()
+
+	@staticmethod
+	async def _send_raw(socket_writer: asyncio.StreamWriter, data: bytes) -> None:
+		if is_trace_enabled():
+			LOGGER.trace("Remote Send: {esc}", esc=repr(data)[2:-1])
+		socket_writer.write(data)
 		await socket_writer.drain()
 
 	## ##
 
+	## Command handlers
+	async def _cmd_on(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		if self._app.start():
+			LOGGER.info("Remote: Commanded start.")
+			await self._send(socket_writer, by_eol, "Started the show.")
+		else:
+			LOGGER.debug("Remote: Start command failed.")
+			await self._send(socket_writer, by_eol, "Can't start the show.")
+
+
+	async def _cmd_off(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		if await self._app.stop():
+			LOGGER.info("Remote: Commanded stop.")
+			await self._send(socket_writer, by_eol, "Stopped the show.")
+		else:
+			LOGGER.debug("Remote: Stop command failed.")
+			await self._send(socket_writer, by_eol, "Can't stop the show.")
+
+
+	async def _cmd_join(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		LOGGER.opt(lazy=True).debug("Remote: Requested JOIN {}.", lambda: truncate_repr(trailing))
+		try:
+			b_res = await self._app.join_channel(trailing)
+		except Exception:
+			await self._send(socket_writer, by_eol, "JOIN command failed.")
+		else:
+			if b_res:
+				await self._send(socket_writer, by_eol, "JOIN command sent.")
+			else:
+				await self._send(socket_writer, by_eol, "TMI is not ready.")
+
+
+	async def _cmd_clear(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		if await self._app.clear_all():
+			LOGGER.info("Remote: Cleared.")
+			await self._send(socket_writer, by_eol, "Cleared matrix display.")
+		else:
+			LOGGER.debug("Remote: Clear all command failed.")
+			await self._send(socket_writer, by_eol, "Error clearing matrix display.")
+
+
+	async def _cmd_pause(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		if self._app.pause():
+			LOGGER.info("Remote: Paused display.")
+			await self._send(socket_writer, by_eol, "Paused display.")
+		else:
+			LOGGER.debug("Remote: Requested PAUSE while not running.")
+			await self._send(socket_writer, by_eol, "Show is not running!")
+
+
+	async def _cmd_resume(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		if self._app.resume():
+			LOGGER.info("Remote: Resumed displaying images.")
+			await self._send(socket_writer, by_eol, "Resumed display.")
+		else:
+			LOGGER.debug("Remote: Requested RESUME while not running.")
+			await self._send(socket_writer, by_eol, "Show is not running!")
+
+
+	async def _cmd_usrban(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		nick = trailing.strip()
+		if nick:
+			if len(nick) < 50: # arbitrary !
+				st_usrban = self._app.st_forbidden_usr
+				path_usrban = self._app.path_usrbanfile
+
+				# File path = persistence enabled
+				if path_usrban is not None:
+					# First reload the file
+					st_new = await asyncio.to_thread(self._app.nicks_from_file_line_list, path_usrban)
+					st_usrban.clear()
+					st_usrban.update(st_new)
+
+					# Add username to forbidden set
+					st_usrban.add(nick)
+
+					# Write list to file
+					await asyncio.to_thread(self._app.file_line_list_write, path_usrban, st_usrban)
+
+				# Else just update
+				else:
+					st_usrban.add(nick)
+					await self._send(socket_writer, by_eol, "Persistence disabled.")
+
+				LOGGER.info("Remote: {} added to forbidden users.", nick)
+				await self._send(socket_writer, by_eol, f"User ignored: {nick}")
+
+			else:
+				await self._send(socket_writer, by_eol, "Username too long!")
+		else:
+			await self._send(socket_writer, by_eol, "Invalid username!")
+
+
+	async def _cmd_usrunban(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		nick = trailing.strip()
+		if nick:
+			if len(nick) < 50: # arbitrary !
+				st_usrban = self._app.st_forbidden_usr
+				path_usrban = self._app.path_usrbanfile
+
+				# File path = persistence enabled
+				if path_usrban is not None:
+					# First reload the file
+					st_new = await asyncio.to_thread(self._app.nicks_from_file_line_list, path_usrban)
+					st_usrban.clear()
+					st_usrban.update(st_new)
+
+					# Remove username from forbidden set
+					try:
+						st_usrban.remove(nick)
+
+					except KeyError:
+						await self._send(socket_writer, by_eol, f"User not in forbidden list: {nick}")
+
+					else:
+						# Write list to file
+						await asyncio.to_thread(self._app.file_line_list_write, path_usrban, st_usrban)
+						LOGGER.info("Remote: {} removed from forbidden users.", nick)
+						await self._send(socket_writer, by_eol, f"User unignored: {nick}")
+
+				# Else just update
+				else:
+					await self._send(socket_writer, by_eol, "Persistence disabled.")
+
+					try:
+						st_usrban.remove(nick)
+
+					except KeyError:
+						await self._send(socket_writer, by_eol, f"User not in forbidden list: {nick}")
+
+					else:
+						LOGGER.info("Remote: {} removed from forbidden users.", nick)
+						await self._send(socket_writer, by_eol, f"User unignored: {nick}")
+
+			else:
+				await self._send(socket_writer, by_eol, "Username too long!")
+		else:
+			await self._send(socket_writer, by_eol, "Invalid username!")
+
+
+	async def _cmd_help(self, socket_writer: asyncio.StreamWriter, by_eol: bytes, trailing: str) -> None:
+		await self._send_raw(socket_writer, self.di_help[by_eol])
+
+	## ##
+
 	## Client handler
 	async def _handle_client(self, socket_reader: asyncio.StreamReader, socket_writer: asyncio.StreamWriter) -> None:
-		# Single client, close previous if it exists
-		if self._client_socket_writer != None:
-			self._client_socket_writer.close()
+		# Single client, reset the previous connection (no-op without one)
+		self._reset_connection(self._client_socket_writer)
 
 		self._client_socket_writer = socket_writer
 		s_peername = socket_writer.get_extra_info("peername", ("[unknown]", ))[0]
 		s_hello_message = f"Matrix Display Controller v{PRGM_VERSION}\nType '?' to obtain available commands.\nHello {s_peername}!"
 		b_telnet = False
+		by_eol = b"\n" # line breaks in replies, CR LF in telnet mode
 
 		# Say hi!
 		LOGGER.info("Remote: {peer} opened a command connection.", peer=s_peername)
-		await self._send(socket_writer, b_telnet, s_hello_message)
+		await self._send(socket_writer, by_eol, s_hello_message)
 
 		# Process commands
 		try:
@@ -1120,161 +1565,20 @@ class CommandInterface:
 				cmds, trailing = IRCBase.parse_params(msg)
 
 				if cmds:
-					match cmds[0].lower():
-						case "telnet\r": # telnet sends \r\n therefore a \r will be left over
-							b_telnet = True
-							await self._send(socket_writer, b_telnet, f"CR LF line breaks\nBS is interpreted\n{s_hello_message}")
-
-						case "on":
-							if self._app.start():
-								LOGGER.info("Remote: Commanded start.")
-								await self._send(socket_writer, b_telnet, "Started the show.")
-							else:
-								LOGGER.debug("Remote: Start command failed.")
-								await self._send(socket_writer, b_telnet, "Can't start the show.")
+					s_cmd = cmds[0].lower()
 
-						case "off":
-							if await self._app.stop():
-								LOGGER.info("Remote: Commanded stop.")
-								await self._send(socket_writer, b_telnet, "Stopped the show.")
-							else:
-								LOGGER.debug("Remote: Stop command failed.")
-								await self._send(socket_writer, b_telnet, "Can't stop the show.")
-
-						case "join":
-							LOGGER.debug("Remote: Requested JOIN {}.", textwrap.shorten(repr(trailing), 300))
-							try:
-								b_res = await self._app.join_channel(trailing)
-							except Exception:
-								await self._send(socket_writer, b_telnet, "JOIN command failed.")
-							else:
-								if b_res:
-									await self._send(socket_writer, b_telnet, "JOIN command sent.")
-								else:
-									await self._send(socket_writer, b_telnet, "TMI is not ready.")
-
-						case "clear":
-							if await self._app.clear_all():
-								LOGGER.info("Remote: Cleared.")
-								await self._send(socket_writer, b_telnet, "Cleared matrix display.")
-							else:
-								LOGGER.debug("Remote: Clear all command failed.")
-								await self._send(socket_writer, b_telnet, "Error clearing matrix display.")
-
-						case "pause":
-							if self._app.pause():
-								LOGGER.info("Remote: Paused display.")
-								await self._send(socket_writer, b_telnet, "Paused display.")
-							else:
-								LOGGER.debug("Remote: Requested PAUSE while not running.")
-								await self._send(socket_writer, b_telnet, "Show is not running!")
+					if s_cmd == "telnet\r": # telnet sends \r\n therefore a \r will be left over
+						b_telnet = True
+						by_eol = b"\r\n"
+						await self._send(socket_writer, by_eol, f"CR LF line breaks\nBS is interpreted\n{s_hello_message}")
 
-						case "resume":
-							if self._app.resume():
-								LOGGER.info("Remote: Resumed displaying images.")
-								await self._send(socket_writer, b_telnet, "Resumed display.")
-							else:
-								LOGGER.debug("Remote: Requested RESUME while not running.")
-								await self._send(socket_writer, b_telnet, "Show is not running!")
-
-						case "usrban":
-							nick = trailing.strip()
-							if nick:
-								if len(nick) < 50: # arbitrary !
-									st_usrban = self._app.st_forbidden_usr
-									path_usrban = self._app.path_usrbanfile
-
-									# File path = persistence enabled
-									if path_usrban != None:
-										# First reload the file
-										st_new = await asyncio.to_thread(self._app.nicks_from_file_line_list, path_usrban)
-										st_usrban.clear()
-										st_usrban.update(st_new)
-
-										# Add username to forbidden set
-										st_usrban.add(nick)
-
-										# Write list to file
-										await asyncio.to_thread(self._app.file_line_list_write, path_usrban, st_usrban)
-
-									# Else just update
-									else:
-										st_usrban.add(nick)
-										await self._send(socket_writer, b_telnet, "Persistence disabled.")
-
-									LOGGER.info("Remote: {} added to forbidden users.", nick)
-									await self._send(socket_writer, b_telnet, f"User ignored: {nick}")
-
-								else:
-									await self._send(socket_writer, b_telnet, "Username too long!")
-							else:
-								await self._send(socket_writer, b_telnet, "Invalid username!")
-
-						case "usrunban":
-							nick = trailing.strip()
-							if nick:
-								if len(nick) < 50: # arbitrary !
-									st_usrban = self._app.st_forbidden_usr
-									path_usrban = self._app.path_usrbanfile
-
-									# File path = persistence enabled
-									if path_usrban != None:
-										# First reload the file
-										st_new = await asyncio.to_thread(self._app.nicks_from_file_line_list, path_usrban)
-										st_usrban.clear()
-										st_usrban.update(st_new)
-
-										# Remove username from forbidden set
-										try:
-											st_usrban.remove(nick)
-
-										except KeyError:
-											await self._send(socket_writer, b_telnet, f"User not in forbidden list: {nick}")
-
-										else:
-											# Write list to file
-											await asyncio.to_thread(self._app.file_line_list_write, path_usrban, st_usrban)
-											LOGGER.info("Remote: {} removed from forbidden users.", nick)
-											await self._send(socket_writer, b_telnet, f"User unignored: {nick}")
-
-									# Else just update
-									else:
-										await self._send(socket_writer, b_telnet, "Persistence disabled.")
-
-										try:
-											st_usrban.remove(nick)
-
-										except KeyError:
-											await self._send(socket_writer, b_telnet, f"User not in forbidden list: {nick}")
-
-										else:
-											LOGGER.info("Remote: {} removed from forbidden users.", nick)
-											await self._send(socket_writer, b_telnet, f"User unignored: {nick}")
-
-								else:
-									await self._send(socket_writer, b_telnet, "Username too long!")
-							else:
-								await self._send(socket_writer, b_telnet, "Invalid username!")
-
-						case "?" | "help" | "h":
-							prompt = (
-								"  ** Command list **",
-								"     ? - Shows this message.",
-								"    ON - Starts operation.",
-								"   OFF - Stops operation.",
-								" CLEAR - Clears all queues and the matrix display.",
-								" PAUSE - Stops sending images to the matrix display, emotes and emoji collection remaining active.",
-								"RESUME - Resumes sending images to the matrix display. The backlog is sent.",
-								"TELNET - All line breaks (LF) are converted to CR LF for the lifetime of the connection.",
-								"    JOIN :<#chan>{,<#chan>{,...}} - Joins <#chan>.",
-								"  USRBAN :<nick>                  - Adds <nick> to the list of forbidden usernames.",
-								"USRUNBAN :<nick>                  - Removes <nick> from the list of forbidden usernames."
-							)
-							await self._send(socket_writer, b_telnet, "\n| ".join(prompt))
-
-						case _:
+					else:
+						cmd_handler = self._di_commands.get(s_cmd)
+						if cmd_handler is not None:
+							await cmd_handler(socket_writer, by_eol, trailing)
+						else:
 							LOGGER.debug("Remote: Unknown command.")
-							await self._send(socket_writer, b_telnet, "Unknown command!")
+							await self._send(socket_writer, by_eol, "Unknown command!")
 
 		except (EOFError, ConnectionError) as e:
 			LOGGER.trace("Remote: Connection ended reason = {exc}", exc=exception_str(e))
@@ -1283,7 +1587,7 @@ class CommandInterface:
 	## ##
 
 	## Task
-	async def run(self, tcp_port: int) -> NoReturn: # type: ignore
+	async def run(self, tcp_port: int) -> None:
 		# Start serving
 		try:
 			server = await asyncio.start_server(self._handle_client, port=tcp_port)
@@ -1292,28 +1596,18 @@ class CommandInterface:
 			raise
 		LOGGER.info("Remote: Command interface listening on port {port}.", port=tcp_port)
 
-		# Wait forever
-		try:
-			await asyncio.sleep(float("inf"))
-
-		# Close everything when cancelled
-		except CancelledError:
-			LOGGER.debug("Remote: Shutting down command interface.")
-			# Stop serving
+		# Server context closes the listening socket and waits until all sockets are closed on exit
+		async with server:
+			# Serve until cancelled by the main task group (no timer scheduled, unlike sleep(inf))
+			# Not serve_forever(): on cancellation it awaits wait_closed() before the finally below can close the client writer,
+			# since Python 3.12 that waits for the client connection and never returns
 			try:
-				server.close()
-			except Exception:
-				pass
-			# Close (single) client connection
-			if self._client_socket_writer != None:
+				await asyncio.Event().wait()
+
+			finally:
+				LOGGER.debug("Remote: Shutting down command interface.")
+				# Close (single) client connection
 				self._client_socket_writer.close()
-			# Wait until all sockets are closed
-			try:
-				await server.wait_closed()
-			except Exception:
-				pass
-			# Pass the cancelation
-			raise
 
 	## ##
 
@@ -1323,10 +1617,29 @@ class CommandInterface:
 
 ### Text-mode application ###
 
+CLI_EPILOG = f"Built-in forbidden Twitch emotes: {', '.join(FORBIDDEN_TWITCH_EMOTES)}"
+
+
 class MatrixReloadedApp:
 
 	def __init__(self) -> None:
-		cli = argparse.ArgumentParser(prog=f"Matrix Display Controller v{PRGM_VERSION}", epilog="Built-in forbidden Twitch emotes: " + ", ".join(FORBIDDEN_TWITCH_EMOTES.keys()))
+		self._taskgroup_main: asyncio.TaskGroup | None = None
+		self._task_tmi: asyncio.Task | None = None
+		self._li_show_tasks: list[asyncio.Task] = list() # "the show", run directly in the main task group
+
+		self.emotes_q = EmoteQueue()
+		self.command = CommandInterface(self)
+		self.uploaders = list()
+		# Shared by reference and mutated at runtime (downloader bans missing ids), can't be frozen, same for st_forbidden_usr (USRBAN/USRUNBAN)
+		self.st_forbidden_ids: set[str] = set(FORBIDDEN_TWITCH_EMOTES.values())
+		self.path_usrbanfile: Path | None = None
+
+
+	## CLI parsing helper
+	# Built on first use
+	@functools.cached_property
+	def _cli_parser(self) -> argparse.ArgumentParser:
+		cli = argparse.ArgumentParser(prog=f"Matrix Display Controller v{PRGM_VERSION}", epilog=CLI_EPILOG)
 		cli.add_argument("chan", action="store", nargs="?", default="", help="Required if standalone. Twitch Messaging Interface channel(s) to join. Format: <#chan>{,<#chan>{,...}}")
 		cli.add_argument("--matrix-targets", action="store", default="matrix-reloaded.local", help="Defaults to 'matrix-reloaded.local'. Comma-separated list of matrix display hostname or IP address to connect to. (format location:port)")
 		cli.add_argument("--log-level", action="store", choices=LOGGER._core.levels.keys(), type=str.upper, help="Defaults to INFO. Messages level SUCCESS and higher are output to stderr. Level SUCCESS corresponds to successful events that are important to the user (good warnings), select WARNING if you want to only be notified of failure warnings. Setting log level to DEBUG is suggested while experimenting. TRACE level prints IRC communications, which will expose credentials!") # type: ignore
@@ -1341,20 +1654,8 @@ class MatrixReloadedApp:
 		cli.add_argument("--purge", action="store_true", help="Cleans the local cache and exits. Sometimes emojis get corrections.")
 		cli.add_argument("--version", action="version", version=PRGM_VERSION, help="Shows version and exits.")
 		cli.add_argument("--license", action="store_true", help="Shows license prompt and exits.")
-		self._cli_parser = cli
-
-		self._taskgroup_main: asyncio.TaskGroup | None = None
-		self._task_run_show: asyncio.Task | None = None
-		self._task_tmi: asyncio.Task | None = None
-
-		self.emotes_q = EmoteQueue()
-		self.command = CommandInterface(self)
-		self.uploaders = list()
-		self.st_forbidden_ids = set(FORBIDDEN_TWITCH_EMOTES.values())
-		self.path_usrbanfile: Path | None = None
+		return cli
 
-
-	## CLI parsing helper
 	@staticmethod
 	def separated_list(s: str, separator: str) -> Iterator[str]:
 		return (x.strip() for x in s.split(separator))
@@ -1387,6 +1688,10 @@ class MatrixReloadedApp:
 	## ##
 
 	## Actions
+	def _is_show_running(self) -> bool:
+		return any( (not task.done() for task in self._li_show_tasks) )
+
+
 	def purge_waiting(self) -> None:
 		self.emotes_q.clear()
 		# try:
@@ -1408,20 +1713,24 @@ class MatrixReloadedApp:
 
 
 	def start(self) -> bool:
-		if self._taskgroup_main == None:
+		if self._taskgroup_main is None:
 			raise RuntimeError("App is not running!")
 
-		if self._task_run_show == None or self._task_run_show.done():
-			self._task_run_show = self._taskgroup_main.create_task( self._run_show() )
+		if not self._is_show_running():
+			tg = self._taskgroup_main
+			self._task_tmi = tg.create_task( self.tmi.run() )
+			self._li_show_tasks = [self._task_tmi, tg.create_task( self.downloader.run() )]
+			for uploader in self.uploaders:
+				self._li_show_tasks.append( tg.create_task( uploader.run() ) )
 			return True
 
 		return False
 
 
 	async def stop(self, wait: bool = False) -> bool:
-		if not (self._task_run_show == None or self._task_run_show.done()):
+		if self._is_show_running():
 			# Stop input
-			if not (self._task_tmi == None or self._task_tmi.done()):
+			if not (self._task_tmi is None or self._task_tmi.done()):
 				self._task_tmi.cancel("Stopping the show.")
 				try:
 					await self._task_tmi
@@ -1432,19 +1741,21 @@ class MatrixReloadedApp:
 			await self.clear_all()
 
 			# Stop everything else
-			self._task_run_show.cancel("Stopping the show.")
+			for task in self._li_show_tasks:
+				task.cancel("Stopping the show.")
 			if wait:
-				try:
-					await self._task_run_show
-				except CancelledError:
-					pass
+				for task in self._li_show_tasks:
+					try:
+						await task
+					except CancelledError:
+						pass
 			return True
 
 		return False
 
 
 	def pause(self) -> bool:
-		if not (self._task_run_show == None or self._task_run_show.done()):
+		if self._is_show_running():
 			# Defined if "the show" runs
 			for uploader in self.uploaders:
 				uploader.pause = True
@@ -1454,7 +1765,7 @@ class MatrixReloadedApp:
 
 
 	def resume(self) -> bool:
-		if not (self._task_run_show == None or self._task_run_show.done()):
+		if self._is_show_running():
 			# Defined if "the show" runs
 			for uploader in self.uploaders:
 				uploader.pause = False
@@ -1465,14 +1776,6 @@ class MatrixReloadedApp:
 	## ##
 
 	## Task
-	async def _run_show(self) -> None:
-		async with asyncio.TaskGroup() as tg:
-			self._task_tmi = tg.create_task( self.tmi.run() )
-			tg.create_task( self.downloader.run() )
-			for uploader in self.uploaders:
-				tg.create_task( uploader.run() )
-
-
 	async def main(self) -> None:
 		# Parse command line
 		args = self._cli_parser.parse_args()
@@ -1504,10 +1807,10 @@ class MatrixReloadedApp:
 			self._cli_parser.error("A channel to join must be supplied when remote command interface is not enabled. Try --help to see the list of arguments and their explanation.")
 
 		# List of matrix hosts
-		li_hosts = [netloc for netloc in (item.strip() for item in self.comma_separated_list(args.matrix_targets)) if netloc]
+		li_hosts = [netloc for netloc in self.comma_separated_list(args.matrix_targets) if netloc]
 
 		# Forbidden emotes
-		self.st_forbidden_ids.update( (id for id in self.comma_separated_list(args.forbidden_emotes) if id) )
+		self.st_forbidden_ids.update( (emote_id for emote_id in self.comma_separated_list(args.forbidden_emotes) if emote_id) )
 
 		# Fobidden nicks
 		# Try to read from file if specified
@@ -1521,7 +1824,7 @@ class MatrixReloadedApp:
 				self.path_usrbanfile = path_usrban
 		# Else fall back to CLI
 		else:
-			self.st_forbidden_usr = self.nick_set( self.comma_separated_list(args.forbidden_users) )
+			self.st_forbidden_usr = self.nick_set( self.comma_separated_list(args.forbidden_users) ) # mutable, see USRBAN
 
 		# Configure logging
 		LOGGER.remove()
@@ -1532,14 +1835,15 @@ class MatrixReloadedApp:
 				s_con_format = "<level>{message}</level>"
 
 			if args.quiet:
-				LOGGER.add(sys.stderr, level="SUCCESS" if args.log_level == None else args.log_level, format=s_con_format, diagnose=FULL_LOG_INFO_TO_CONSOLE, backtrace=FULL_LOG_INFO_TO_CONSOLE)
+				LOGGER.add(sys.stderr, level="SUCCESS" if args.log_level is None else args.log_level, format=s_con_format, diagnose=FULL_LOG_INFO_TO_CONSOLE, backtrace=FULL_LOG_INFO_TO_CONSOLE)
 
 			else:
-				s_lvl = "INFO" if args.log_level == None else args.log_level
+				s_lvl = "INFO" if args.log_level is None else args.log_level
 				i_stderr_pivot = LOGGER.level("SUCCESS").no
 
 				if LOGGER.level(s_lvl).no < i_stderr_pivot:
-					LOGGER.add(sys.stdout, filter=lambda record: record["level"].no < i_stderr_pivot, level=s_lvl, format=s_con_format, diagnose=FULL_LOG_INFO_TO_CONSOLE, backtrace=FULL_LOG_INFO_TO_CONSOLE)
+					# loguru has no maximum level, a filter callable is required (only called for records passing level=)
+					LOGGER.add(sys.stdout, filter=lambda record, i_pivot=i_stderr_pivot: record["level"].no < i_pivot, level=s_lvl, format=s_con_format, diagnose=FULL_LOG_INFO_TO_CONSOLE, backtrace=FULL_LOG_INFO_TO_CONSOLE)
 					LOGGER.add(sys.stderr, level=i_stderr_pivot, format=s_con_format, diagnose=FULL_LOG_INFO_TO_CONSOLE, backtrace=FULL_LOG_INFO_TO_CONSOLE)
 
 				else:
@@ -1572,19 +1876,26 @@ class MatrixReloadedApp:
 			LOGGER.info("Summation of emote instances per message is disabled.")
 
 		# Run
-		async with asyncio.TaskGroup() as tg:
-			# Make the group universally usable (dangerous)
-			self._taskgroup_main = tg
-
-			# Start command interface
-			if args.command_port:
-				tg.create_task( self.command.run(args.command_port) )
-
-			# Start if not in interactive mode
-			if not (args.interactive and args.command_port):
-				self.start()
-		# Remove the reference after the context manager exits
-		self._taskgroup_main = None
+		try:
+			async with asyncio.TaskGroup() as tg:
+				# Make the group universally usable (dangerous)
+				self._taskgroup_main = tg
+
+				# Start command interface
+				if args.command_port:
+					tg.create_task( self.command.run(args.command_port) )
+
+				# Start if not in interactive mode
+				if not (args.interactive and args.command_port):
+					self.start()
+
+		finally:
+			# Remove the reference after the context manager exits
+			self._taskgroup_main = None
+			# HTTP sessions outlive the show, close them last
+			await self.downloader.close()
+			for uploader in self.uploaders:
+				await uploader.close()
 
 	## ##
 
@@ -1597,7 +1908,13 @@ class MatrixReloadedApp:
 if __name__ == '__main__':
 	try:
 		app = MatrixReloadedApp()
-		asyncio.run( app.main() )
+		if uvloop is None:
+			asyncio.run( app.main() )
+		elif sys.version_info >= (3, 12):
+			asyncio.run( app.main(), loop_factory=uvloop.new_event_loop )
+		else:
+			uvloop.install()
+			asyncio.run( app.main() )
 	except KeyboardInterrupt:
 		LOGGER.debug("User exit.")
 	except Exception: